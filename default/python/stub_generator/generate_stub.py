@@ -3,10 +3,10 @@ from operator import itemgetter
 
 from common.print_utils import Table, Text
 from stub_generator.constants import ATTRS, CLASS_NAME, DOC, ENUM_PAIRS, NAME, PARENTS, TYPE
-from stub_generator.parse_docs import Docs
+from stub_generator.parse_docs import make_docs
 
 
-def _handle_class(info):
+def _handle_class(info, docs_cache):
     name = info[NAME]
     docs = info[DOC]
     attrs = info[ATTRS]
@@ -53,20 +53,20 @@ def _handle_class(info):
         result.append('')
 
     for routine_name, routine_docs in instance_methods:
-        docs = Docs(routine_docs, 2, is_class=True)
+        docs = make_docs(docs_cache, routine_docs, 2, is_class=True)
         # TODO: Subclass map-like classes from dict (or custom class) rather than this hack
+        rtype = docs.rtype
+        if rtype in ('VisibilityIntMap', 'IntIntMap'):
+            rtype = 'Dict[int, int]'
 
-        if docs.rtype in ('VisibilityIntMap', 'IntIntMap'):
-            docs.rtype = 'Dict[int, int]'
-
-        doc_string = docs.get_doc_string()
+        argument_string, doc_string = docs.render()
         if doc_string:
             doc_string = '\n' + doc_string
             end = ''
         else:
             end = '\n        ...'
         result.append(
-            '    def %s(%s) -> %s:%s%s' % (routine_name, docs.get_argument_string(), docs.rtype, doc_string, end))
+            '    def %s(%s) -> %s:%s%s' % (routine_name, argument_string, rtype, doc_string, end))
         result.append('')
     if not (properties or instance_methods):
         result.append('    ...')
@@ -75,17 +75,17 @@ def _handle_class(info):
     return '\n'.join(result)
 
 
-def _handle_function(doc):
+def _handle_function(doc, docs_cache):
     name = doc[NAME]
-    doc = Docs(doc[DOC], 1)
+    doc = make_docs(docs_cache, doc[DOC], 1)
     return_annotation = ' -> %s' % doc.rtype if doc.rtype else ''
-    docstring = doc.get_doc_string()
+    argument_string, docstring = doc.render()
     if docstring:
         docstring = '\n' + docstring
         end = ''
     else:
         end = '\n    ...'
-    res = 'def %s(%s) %s:%s%s' % (name, doc.get_argument_string(), return_annotation, docstring, end)
+    res = 'def %s(%s) %s:%s%s' % (name, argument_string, return_annotation, docstring, end)
     return res
 
 
@@ -212,8 +212,12 @@ def make_stub(data, result_path, classes_to_ignore: set):
         len(class_[PARENTS]), class_[PARENTS] and class_[PARENTS][0] or '',
         class_[NAME]))  # put classes with no parents on first place
 
+    # Stubs are generated inside the game's embedded interpreter, where sys.executable is the game binary,
+    # so handlers are run in this process instead of a multiprocessing pool.
+    # Parsed docs are cached for this run only.
+    docs_cache = {}
     for cls in classes:
-        res.append(_handle_class(cls))
+        res.append(_handle_class(cls, docs_cache))
 
     res.append(ENUM_STUB)
 
@@ -221,7 +225,7 @@ def make_stub(data, result_path, classes_to_ignore: set):
         res.append(_handle_enum(enum))
 
     for function in sorted(functions, key=itemgetter(NAME)):
-        res.append(_handle_function(function))
+        res.append(_handle_function(function, docs_cache))
 
     with open(result_path, 'w') as f:
         f.write('\n\n\n'.join(res))
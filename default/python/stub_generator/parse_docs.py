@@ -1,6 +1,15 @@
-from logging import error
+from collections import Counter, defaultdict
+from itertools import islice
+from logging import ERROR, error, getLogger
 import re
-from typing import Iterable, List, Tuple
+from sys import intern
+from typing import Dict, Iterable, List, Tuple
+
+_SIG_RE = re.compile(r'(\w+)\((.*)\) -> (\w+)')
+_PARSE_NAME_RE = re.compile(r'\w+\((.*)\) -> (.+) :')
+_ARG_RE = re.compile(r'\((\w+)\) *(\w+)')
+
+_MISSING = object()
 
 normalization_dict = {
     'empire': 'empire_object',
@@ -72,44 +81,92 @@ def normalize_name(tp):
     if not provided_name.startswith('arg'):
         return provided_name
 
-    if argument_type not in normalization_dict:
+    name = normalization_dict.get(argument_type, _MISSING)
+    if name is _MISSING:
         error("Can't find proper name for: %s, please add it to name mapping \n" % argument_type)
         normalization_dict[argument_type] = 'arg'
-    return normalization_dict[argument_type]
+        return 'arg'
+    return name
 
 
 def get_argument_names(arguments, is_class):
-    counts = {}
-    names = []
-
+    counts = defaultdict(int)
+    # types keep the type of the first argument of a method, it is paired with "self"
     types = [x[0] for x in arguments]
-
-    if is_class:
-        arguments = arguments[1:]
-
-    arg_names = [normalize_name(tp) for tp in arguments]
-    for tp, arg_name in zip(arguments, arg_names):
-        if arg_names.count(arg_name) == 1:
-            suffix = ''
+    names = ['self'] if is_class else []
+
+    arg_names = [normalize_name(tp) for tp in islice(arguments, int(is_class), None)]
+    duplicated = {arg_name for arg_name, count in Counter(arg_names).items() if count > 1}
+    append = names.append
+    for arg_name in arg_names:
+        if arg_name in duplicated:
+            counts[arg_name] += 1
+            append(f'{arg_name}{counts[arg_name]}')
         else:
-            if arg_name in counts:
-                counts[arg_name] += 1
-            else:
-                counts[arg_name] = 1
-            suffix = str(counts[arg_name])
-        names.append('%s%s' % (arg_name, suffix))
-    if is_class:
-        names.insert(0, 'self')
+            append(arg_name)
     return names, types
 
 
+def _split_signature(txt):
+    """
+    Split "name(args) -> rest" into its parts using fixed delimiters.
+
+    Return None if text does not have that shape, callers fall back to regex in that case.
+    """
+    name, sep, tail = txt.partition('(')
+    if not sep or not name.isidentifier():
+        return None
+    args, sep, rest = tail.rpartition(') -> ')
+    if not sep:
+        return None
+    return name, args, rest
+
+
 def parse_name(txt):
-    match = re.match(r'\w+\((.*)\) -> (.+) :', txt)
-    args, return_type = match.group(1, 2)
+    parts = _split_signature(txt)
+    return_type = parts[2].rpartition(' :')[0] if parts else ''
+    if return_type:
+        args = parts[1]
+    else:
+        args, return_type = _PARSE_NAME_RE.match(txt).group(1, 2)
     args = [x.strip(' (').split(')') for x in args.split(',') if x]
     return [x[0] for x in args], return_type
 
 
+def _parse_args(args):
+    """
+    Parse comma separated "(type) name" pairs of a signature.
+
+    Fall back to regex if any part does not have that shape.
+    """
+    result = []
+    for part in args.split(','):
+        head, sep, arg_name = part.partition(')')
+        if not sep:
+            if part.strip(' []'):
+                break
+            continue
+        lead, sep, tp = head.partition('(')
+        arg_name = arg_name.split('=', 1)[0].strip(' []')
+        if not sep or lead.strip(' [') or not tp.isidentifier() or not arg_name.isidentifier():
+            break
+        result.append((intern(tp), intern(arg_name)))
+    else:
+        return tuple(result)
+    return tuple((intern(tp), intern(arg_name)) for tp, arg_name in _ARG_RE.findall(args))
+
+
+def parse_signature(line):
+    parts = _split_signature(line)
+    rtype = parts[2].split(None, 1) if parts else None
+    if rtype and rtype[0].isidentifier():
+        name, args, _ = parts
+        rtype = rtype[0]
+    else:
+        name, args, rtype = _SIG_RE.match(line).group(1, 2, 3)
+    return intern(name), _parse_args(args), intern(rtype)
+
+
 def _get_duplicated_arguments_message(name, raw_arg_types) -> Iterable[str]:
     yield ""
     yield "Cannot merge different set of arguments for a callable: %s" % name
@@ -129,7 +186,17 @@ def merge_args(name: str, raw_arg_types: List[tuple], is_class: bool) -> Tuple[L
     # If wrapper define functions that have same name, and same arguments but different return types,
     # it will come here with len(arg_types) >= 2, where all arguments set are the same.
     size = len(raw_arg_types)
-    arg_types = sorted(set(raw_arg_types))
+    if size == 1:
+        names, types = get_argument_names(raw_arg_types[0], is_class)
+        return names, list(zip(names, types))
+
+    if size == 2:
+        first, second = raw_arg_types
+        if first != second and not (first and second):
+            names, types = get_argument_names(first or second, is_class)
+            return ['%s=None' % arg_name for arg_name in names], list(zip(names, types))
+
+    arg_types = list(dict.fromkeys(raw_arg_types))
     if len(arg_types) != size:
         error("[%s] Duplicated argument types", name)
 
@@ -142,62 +209,79 @@ def merge_args(name: str, raw_arg_types: List[tuple], is_class: bool) -> Tuple[L
         use_keyword = True
     else:
 
-        error("\n".join(_get_duplicated_arguments_message(name, raw_arg_types)))
+        if getLogger().isEnabledFor(ERROR):
+            error("\n".join(_get_duplicated_arguments_message(name, raw_arg_types)))
 
         names, types = get_argument_names(raw_arg_types[0], is_class)
         use_keyword = False
     return ['%s=None' % arg_name for arg_name in names] if use_keyword else names, list(zip(names, types))
 
 
-def normalize_rtype(rtype):
-    if rtype == 'iterator':
-        return 'iter'
-    return rtype
+_RTYPE_MAP = {'iterator': 'iter'}
 
 
 class Docs:
+    __slots__ = (
+        'indent', 'is_class', '_arg_start', '_self_prefix', 'rtype', 'args', '_header', '_raw_infos', 'text',
+        'argument_declaration',
+    )
+
     def __init__(self, text, indent, is_class=False):
         self.indent = indent
         self.is_class = is_class
+        self._arg_start = int(is_class)
+        self._self_prefix = ('self',) if is_class else ()
 
         if not text:
             self.rtype = 'unknown'
             self.args = ['*args']
-            self.header = ''
+            self._header = ''
+            self._raw_infos = ()
+            self.text = None
             return
 
         self.text = text
 
         lines = [x.strip() for x in self.text.split('\n')]
 
-        def parse_signature(line):
-            expre = re.compile(r'(\w+)\((.*)\) -> (\w+)')
-            name, args, rtype = expre.match(line).group(1, 2, 3)
-            args = tuple(re.findall(r'\((\w+)\) *(\w+)', args))
-            return name, args, rtype
-
-        res = []
+        args_list = []
+        rtypes_list = []
+        infos_list = []
         name, args, rtype = parse_signature(lines[0])
-        res.append((args, rtype, []))
+        args_list.append(args)
+        rtypes_list.append(rtype)
+        infos_list.append([])
         for line in lines[1:]:
             if line.startswith('%s(' % name):
                 name, args, rtype = parse_signature(line)
-                res.append((args, rtype, []))
+                args_list.append(args)
+                rtypes_list.append(rtype)
+                infos_list.append([])
             else:
-                res[-1][2].append(line)
-
-        self.resources = res
+                infos_list[-1].append(line)
 
-        args, rtypes, infos = zip(*res)
-        if len(set(rtypes)) != 1:
+        if len(set(rtypes_list)) != 1:
             error("[%s] Different rtypes", name)
-        self.rtype = normalize_rtype(rtypes[0])
+        rtype = rtypes_list[0]
+        self.rtype = _RTYPE_MAP.get(rtype, rtype)
+
+        # doc lines are joined into header on first access, see header property
+        self._raw_infos = infos_list
+        self._header = None
+        argument_declaration, args = merge_args(name, args_list, self.is_class)
+        self.argument_declaration = argument_declaration
+        self.args = args
+
+    @property
+    def header(self):
+        if self._header is not None:
+            return self._header
 
         # cut of first and last string if they are empty
         # we cant cut off all empty lines, because it can be inside docstring
         doc_lines = []
 
-        for doc_part in infos:
+        for doc_part in self._raw_infos:
             if not doc_part:
                 continue
             else:
@@ -211,29 +295,49 @@ class Docs:
                 doc_lines.append('\n'.join(doc_part))
 
         # if docs are equals show only one of them
-        self.header = sorted(doc_lines)
-        argument_declaration, args = merge_args(name, args, self.is_class)
-        self.argument_declaration = argument_declaration
-        self.args = args
+        self._header = sorted(doc_lines)
+        return self._header
 
-    def get_argument_string(self):
-
-        if self.is_class:
-            args = ['self']
-        else:
-            args = []
-        args.extend("%s: %s" % (arg_name, arg_type) for arg_name, arg_type in self.args[self.is_class:])
+    def _build_argument_string(self):
+        args = list(self._self_prefix)
+        args.extend([f"{arg_name}: {arg_type}" for arg_name, arg_type in self.args[self._arg_start:]])
         return ', '.join(args)
 
+    def _build_doc_string(self):
+        header = self.header
+        if not header:
+            return ''
+        pad = ' ' * 4 * self.indent
+        doc = [f'{pad}"""']
+        doc.extend([f'{pad}{x}' if x else x for x in header])
+        doc.append(f'{pad}"""')
+        return '\n'.join(doc)
+
+    def render(self) -> Tuple[str, str]:
+        """
+        Return argument string and doc string of the callable.
+        """
+        return self._build_argument_string(), self._build_doc_string()
+
+    def get_argument_string(self):
+        return self._build_argument_string()
+
     def get_doc_string(self):
-        doc = []
-        if self.header:
-            doc.append('"""')
-            if self.header:
-                doc.extend(self.header)
-            doc.append('"""')
-
-        return '\n'.join('%s%s' % (' ' * 4 * self.indent if x else '', x) for x in doc)
+        return self._build_doc_string()
+
+
+def make_docs(cache: Dict[tuple, Docs], text, indent, is_class=False) -> Docs:
+    """
+    Return Docs for the given arguments, reusing an instance already parsed into the cache if possible.
+
+    Instances are shared between callers, so they and their args and header lists must not be modified.
+    Parse errors are logged only once, when the instance is created.
+    """
+    key = (text, indent, is_class)
+    docs = cache.get(key)
+    if docs is None:
+        docs = cache[key] = Docs(text, indent, is_class)
+    return docs
 
 
 if __name__ == '__main__':
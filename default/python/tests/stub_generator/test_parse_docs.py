@@ -0,0 +1,69 @@
+from stub_generator.parse_docs import Docs, parse_name, parse_signature
+
+
+def test_parse_signature():
+    assert parse_signature('getEmpire( (int)arg1, (str)name) -> empire :') == (
+        'getEmpire', (('int', 'arg1'), ('str', 'name')), 'empire')
+
+
+def test_parse_signature_without_arguments():
+    assert parse_signature('getUserDataDir() -> str :') == ('getUserDataDir', (), 'str')
+
+
+def test_parse_signature_with_optional_arguments():
+    assert parse_signature('f( (int)arg1 [, (float)arg2 [, (str)arg3]]) -> None') == (
+        'f', (('int', 'arg1'), ('float', 'arg2'), ('str', 'arg3')), 'None')
+
+
+def test_parse_signature_with_default_values():
+    assert parse_signature('f( (int)a, (float)b=0.0) -> None') == ('f', (('int', 'a'), ('float', 'b')), 'None')
+
+
+def test_parse_signature_ignores_signature_inside_default_value():
+    # regex-only parsing used to pick up (int)z from the default value as a third argument
+    assert parse_signature("f( (int)a, (str)s='(int)z') -> int") == ('f', (('int', 'a'), ('str', 's')), 'int')
+
+
+def test_parse_signature_with_space_between_type_and_name():
+    assert parse_signature('f( (int) a) -> int') == ('f', (('int', 'a'),), 'int')
+
+
+def test_parse_signature_falls_back_to_regex_for_non_identifier_types():
+    assert parse_signature('f( (std::string)a, (int)b) -> int') == ('f', (('int', 'b'),), 'int')
+
+
+def test_parse_signature_without_space_before_colon():
+    assert parse_signature('f( (int)a) -> str:') == ('f', (('int', 'a'),), 'str')
+
+
+def test_parse_name():
+    assert parse_name('getEmpire( (int)arg1, (str)name) -> empire :') == (['int', 'str'], 'empire')
+
+
+def test_parse_name_without_arguments():
+    assert parse_name('getUserDataDir() -> str :') == ([], 'str')
+
+
+def test_docs_numbers_duplicated_argument_names():
+    docs = Docs('f( (int)arg1, (str)arg2, (int)arg3) -> iterator', 1)
+    assert docs.get_argument_string() == 'number1: int, string: str, number2: int'
+    assert docs.rtype == 'iter'
+
+
+def test_docs_for_method():
+    docs = Docs('hasPart( (ship)arg1, (str)arg2) -> bool :\n\n    Returns true.\n', 2, is_class=True)
+    assert docs.render() == ('self, string: str', '        """\n        Returns true.\n        """')
+
+
+def test_docs_uses_keywords_for_optional_argument_set():
+    docs = Docs('getEmpire() -> empire\n\ngetEmpire( (int)arg1) -> empire', 1)
+    assert docs.argument_declaration == ['number=None']
+    assert docs.get_argument_string() == 'number: int'
+
+
+def test_docs_header_is_built_only_for_doc_string():
+    docs = Docs('f( (int)arg1) -> int :\n    doc\n', 1)
+    docs.get_argument_string()
+    assert docs._header is None
+    assert docs.get_doc_string() == '    """\n    doc\n    """'
+    assert docs._header == ['doc']